@@ -1,16 +1,80 @@
 #!/usr/bin/env python3
 """
 BibCite Core - Citation formatting logic
+
+Everything here is string processing running under Pyodide. Do not put
+the formatters behind Numba @njit: nopython mode does not support these
+str operations, and object mode is slower than plain Python. Only a
+purely numeric routine (none exists today) would be a candidate, and it
+would still need a pure-Python fallback.
 """
 
 import bibtexparser
 from bibtexparser.bparser import BibTexParser
 from bibtexparser.customization import convert_to_unicode
 import re
+import sys
+from collections import namedtuple
+from functools import lru_cache
 from typing import List, Dict
 from enum import Enum
 
 
+# LaTeX cleanup: one compiled alternation handles markup commands, brace
+# groups, literal substitutions and accents in a single pass.
+_LATEX_LITERALS = {
+    "\\&": "&", "~": " ", "---": "-", "--": "-",
+    r"\'e": "é", r"\'a": "á", r"\'i": "í", r"\'o": "ó", r"\'u": "ú",
+    r"\`e": "è", r"\`a": "à", r"\"o": "ö", r"\"u": "ü", r"\"a": "ä",
+    r"\~n": "ñ", r"\c{c}": "ç", r"\ss": "ß"
+}
+# Markup content may hold two nested brace levels, e.g. \textit{Andr\'{e}} or
+# \emph{a \textit{b}}. A bare brace group keeps [^}]'s lone "{" so that
+# {{a}} still gives {a}, but lets markup and braced accents inside it
+# close their own braces, e.g. {\textit{in vivo}}.
+_LATEX_N1 = r'(?:[^{}]|\{[^{}]*\})*'
+_LATEX_NESTED = r'((?:[^{}]|\{' + _LATEX_N1 + r'\})*)'
+_LATEX_BRACED = (r'\{((?:\\(?:text(?:it|bf)|emph)\{' + _LATEX_N1 + r'\}|\{\\em\s' + _LATEX_N1
+                 + r'\}|\\[\'`"~]\{\w\}|[^{}]|\{)*)\}')
+_LATEX_RE = re.compile(
+    r'\\text(?:it|bf)\{' + _LATEX_NESTED + r'\}|\\emph\{' + _LATEX_NESTED + r'\}|'
+    r'\{\\em\s+' + _LATEX_NESTED + r'\}|'
+    # Braced accents (\'{e}) are looked up under their unbraced form
+    r'(\\[\'`"~])\{(\w)\}|'
+    # Literals go before the bare brace group so that \c{c} wins; longest first so --- beats --
+    + '|'.join(map(re.escape, sorted(_LATEX_LITERALS, key=len, reverse=True)))
+    + '|' + _LATEX_BRACED
+)
+_LATEX_ACCENT_GROUP = 5
+
+
+def _latex_sub(m: re.Match) -> str:
+    if m.lastindex == _LATEX_ACCENT_GROUP:
+        accent = m.group(4) + m.group(5)
+        return _LATEX_LITERALS.get(accent, accent)
+    if m.lastindex:
+        # Stripped group content may itself hold accents or literals
+        return _LATEX_RE.sub(_latex_sub, m.group(m.lastindex))
+    return _LATEX_LITERALS[m.group(0)]
+
+
+# Explicit character classes are cheaper than re.IGNORECASE and match the same words
+_RE_AND = re.compile(r'\s+[Aa][Nn][Dd]\s+')
+
+# Per-entry cache of CitationFormatter._get_fields, keyed on these raw fields
+_FIELDS_CACHE_KEY = "_bibcite_fields"
+_FIELD_SOURCE_KEYS = ("author", "title", "journal", "year", "volume", "number",
+                      "pages", "doi", "publisher", "address", "edition", "isbn", "ENTRYTYPE")
+
+
+# Parsed author name; both fields are always strings ("" when absent)
+Author = namedtuple('Author', 'family given')
+
+# Cleaned entry fields shared by all citation styles (see CitationFormatter._get_fields)
+Fields = namedtuple('Fields', 'authors title journal year volume issue vol_issue pages pages_hyphen detail '
+                              'doi publisher address edition isbn entry_type author_cache render_cache')
+
+
 class SortOrder(Enum):
     AUTHOR_ASC = "Author (A-Z)"
     AUTHOR_DESC = "Author (Z-A)"
@@ -19,6 +83,13 @@ class SortOrder(Enum):
     APPEARANCE = "Order of Appearance"
 
 
+_RE_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def _rtf_unicode_sub(m: re.Match) -> str:
+    return f"\\u{ord(m.group())}?"
+
+
 class RTFBuilder:
     """RTF formatting helper"""
     
@@ -32,25 +103,22 @@ class RTFBuilder:
         text = text.replace("\\", "\\\\")
         text = text.replace("{", "\\{")
         text = text.replace("}", "\\}")
-        result = []
-        for char in text:
-            if ord(char) > 127:
-                result.append(f"\\u{ord(char)}?")
-            else:
-                result.append(char)
-        return "".join(result)
+        # Most bibliographic fields are plain ASCII and need no \uN? escapes
+        if text.isascii():
+            return text
+        return _RE_NON_ASCII.sub(_rtf_unicode_sub, text)
     
     @staticmethod
     def italic(text: str) -> str:
-        return f"{{\\i {RTFBuilder.escape(text)}}}"
+        return _italic(text)
     
     @staticmethod
     def bold(text: str) -> str:
-        return f"{{\\b {RTFBuilder.escape(text)}}}"
+        return _bold(text)
     
     @staticmethod
     def superscript(text: str) -> str:
-        return f"{{\\super {RTFBuilder.escape(text)}}}"
+        return _superscript(text)
     
     @staticmethod
     def newline() -> str:
@@ -61,6 +129,22 @@ class RTFBuilder:
         return f"{RTFBuilder.HEADER}{content}{RTFBuilder.FOOTER}"
 
 
+# Plain-function forms of the RTF wrappers for the hot rendering path
+_escape = RTFBuilder.escape
+
+
+def _italic(text: str) -> str:
+    return "{\\i " + _escape(text) + "}"
+
+
+def _bold(text: str) -> str:
+    return "{\\b " + _escape(text) + "}"
+
+
+def _superscript(text: str) -> str:
+    return "{\\super " + _escape(text) + "}"
+
+
 class BibTeXProcessor:
     """BibTeX parsing and text cleaning"""
     
@@ -75,34 +159,19 @@ class BibTeXProcessor:
             raise ValueError(f"BibTeX parsing error: {str(e)}")
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def clean_latex(text: str) -> str:
         if not text:
             return ""
-        text = re.sub(r'\\textit\{([^}]*)\}', r'\1', text)
-        text = re.sub(r'\\textbf\{([^}]*)\}', r'\1', text)
-        text = re.sub(r'\\emph\{([^}]*)\}', r'\1', text)
-        text = re.sub(r'\{\\em\s+([^}]*)\}', r'\1', text)
-        text = re.sub(r'\{([^}]*)\}', r'\1', text)
-        text = text.replace("\\&", "&")
-        text = text.replace("~", " ")
-        text = text.replace("--", "-")
-        text = text.replace("---", "-")
-        accent_map = {
-            r"\'e": "é", r"\'a": "á", r"\'i": "í", r"\'o": "ó", r"\'u": "ú",
-            r"\`e": "è", r"\`a": "à", r"\"o": "ö", r"\"u": "ü", r"\"a": "ä",
-            r"\~n": "ñ", r"\c{c}": "ç", r"\ss": "ß"
-        }
-        for latex, char in accent_map.items():
-            text = text.replace(latex, char)
-        return text.strip()
-    
-    @staticmethod
-    def parse_authors(author_string: str) -> List[Dict]:
+        return _LATEX_RE.sub(_latex_sub, text).strip()
+    
+    @staticmethod
+    def parse_authors(author_string: str) -> List[Author]:
         if not author_string:
             return []
         author_string = BibTeXProcessor.clean_latex(author_string)
         authors = []
-        author_parts = re.split(r'\s+and\s+', author_string, flags=re.IGNORECASE)
+        author_parts = _RE_AND.split(author_string)
         for author in author_parts:
             author = author.strip()
             if not author:
@@ -119,7 +188,7 @@ class BibTeXProcessor:
                 else:
                     family = parts[-1]
                     given = " ".join(parts[:-1])
-            authors.append({"family": family, "given": given})
+            authors.append(Author(family, given))
         return authors
 
 
@@ -127,6 +196,7 @@ class AuthorFormatter:
     """Author name formatting for various styles"""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def initials(given: str, separator: str = " ", trailing: str = ".") -> str:
         if not given:
             return ""
@@ -134,15 +204,15 @@ class AuthorFormatter:
         return separator.join(parts)
     
     @staticmethod
-    def acs(authors: List[Dict], max_n: int = 10, reverse_authors: bool = False) -> str:
+    def acs(authors: List[Author], max_n: int = 10, reverse_authors: bool = False) -> str:
         """ACS: Family, G. I.; Family, G. I."""
         if not authors:
             return ""
         fmt = []
         for a in authors[:max_n]:
-            init = AuthorFormatter.initials(a.get("given", ""), " ", ".")
-            fam = a.get("family", "")
-            fmt.append(f"{fam}, {init}" if init else fam)
+            init = AuthorFormatter.initials(a.given, " ", ".")
+            fam = a.family
+            fmt.append((fam + ", " + init) if init else fam)
         if reverse_authors and len(fmt) >= 2:
             fmt[0], fmt[-1] = fmt[-1], fmt[0]
         if len(authors) > max_n:
@@ -150,15 +220,15 @@ class AuthorFormatter:
         return "; ".join(fmt)
     
     @staticmethod
-    def apa(authors: List[Dict], max_n: int = 7, reverse_authors: bool = False) -> str:
+    def apa(authors: List[Author], max_n: int = 7, reverse_authors: bool = False) -> str:
         """APA: Family, G. I., & Family, G. I."""
         if not authors:
             return ""
         fmt = []
         for a in authors[:max_n]:
-            init = AuthorFormatter.initials(a.get("given", ""), " ", ".")
-            fam = a.get("family", "")
-            fmt.append(f"{fam}, {init}" if init else fam)
+            init = AuthorFormatter.initials(a.given, " ", ".")
+            fam = a.family
+            fmt.append((fam + ", " + init) if init else fam)
         if reverse_authors and len(fmt) >= 2:
             fmt[0], fmt[-1] = fmt[-1], fmt[0]
         if len(authors) > max_n:
@@ -166,20 +236,20 @@ class AuthorFormatter:
         elif len(fmt) == 1:
             return fmt[0]
         elif len(fmt) == 2:
-            return f"{fmt[0]} & {fmt[1]}"
+            return fmt[0] + " & " + fmt[1]
         else:
             return ", ".join(fmt[:-1]) + ", & " + fmt[-1]
     
     @staticmethod
-    def vancouver(authors: List[Dict], max_n: int = 6, reverse_authors: bool = False) -> str:
+    def vancouver(authors: List[Author], max_n: int = 6, reverse_authors: bool = False) -> str:
         """Vancouver: Family GI, Family GI"""
         if not authors:
             return ""
         fmt = []
         for a in authors[:max_n]:
-            init = AuthorFormatter.initials(a.get("given", ""), "", "")
-            fam = a.get("family", "")
-            fmt.append(f"{fam} {init}" if init else fam)
+            init = AuthorFormatter.initials(a.given, "", "")
+            fam = a.family
+            fmt.append((fam + " " + init) if init else fam)
         if reverse_authors and len(fmt) >= 2:
             fmt[0], fmt[-1] = fmt[-1], fmt[0]
         if len(authors) > max_n:
@@ -187,15 +257,15 @@ class AuthorFormatter:
         return ", ".join(fmt)
     
     @staticmethod
-    def nature(authors: List[Dict], max_n: int = 5, reverse_authors: bool = False) -> str:
+    def nature(authors: List[Author], max_n: int = 5, reverse_authors: bool = False) -> str:
         """Nature: Family, G. I. & Family, G. I."""
         if not authors:
             return ""
         fmt = []
         for a in authors[:max_n]:
-            init = AuthorFormatter.initials(a.get("given", ""), " ", ".")
-            fam = a.get("family", "")
-            fmt.append(f"{fam}, {init}" if init else fam)
+            init = AuthorFormatter.initials(a.given, " ", ".")
+            fam = a.family
+            fmt.append((fam + ", " + init) if init else fam)
         if reverse_authors and len(fmt) >= 2:
             fmt[0], fmt[-1] = fmt[-1], fmt[0]
         if len(authors) > max_n:
@@ -203,20 +273,20 @@ class AuthorFormatter:
         elif len(fmt) == 1:
             return fmt[0]
         elif len(fmt) == 2:
-            return f"{fmt[0]} & {fmt[1]}"
+            return fmt[0] + " & " + fmt[1]
         else:
             return ", ".join(fmt[:-1]) + " & " + fmt[-1]
     
     @staticmethod
-    def ieee(authors: List[Dict], max_n: int = 6, reverse_authors: bool = False) -> str:
+    def ieee(authors: List[Author], max_n: int = 6, reverse_authors: bool = False) -> str:
         """IEEE: G. I. Family, G. I. Family, and G. I. Family"""
         if not authors:
             return ""
         fmt = []
         for a in authors[:max_n]:
-            init = AuthorFormatter.initials(a.get("given", ""), " ", ".")
-            fam = a.get("family", "")
-            fmt.append(f"{init} {fam}" if init else fam)
+            init = AuthorFormatter.initials(a.given, " ", ".")
+            fam = a.family
+            fmt.append((init + " " + fam) if init else fam)
         if reverse_authors and len(fmt) >= 2:
             fmt[0], fmt[-1] = fmt[-1], fmt[0]
         if len(authors) > max_n:
@@ -224,20 +294,20 @@ class AuthorFormatter:
         elif len(fmt) == 1:
             return fmt[0]
         elif len(fmt) == 2:
-            return f"{fmt[0]} and {fmt[1]}"
+            return fmt[0] + " and " + fmt[1]
         else:
             return ", ".join(fmt[:-1]) + ", and " + fmt[-1]
     
     @staticmethod
-    def iso690(authors: List[Dict], max_n: int = 3, reverse_authors: bool = False) -> str:
+    def iso690(authors: List[Author], max_n: int = 3, reverse_authors: bool = False) -> str:
         """ISO 690: FAMILY, Given"""
         if not authors:
             return ""
         fmt = []
         for a in authors[:max_n]:
-            given = a.get("given", "")
-            fam = a.get("family", "").upper()
-            fmt.append(f"{fam}, {given}" if given else fam)
+            given = a.given
+            fam = a.family.upper()
+            fmt.append((fam + ", " + given) if given else fam)
         if reverse_authors and len(fmt) >= 2:
             fmt[0], fmt[-1] = fmt[-1], fmt[0]
         if len(authors) > max_n:
@@ -245,20 +315,16 @@ class AuthorFormatter:
         return ", ".join(fmt)
     
     @staticmethod
-    def harvard(authors: List[Dict], max_n: int = 3, reverse_authors: bool = False) -> str:
+    def harvard(authors: List[Author], max_n: int = 3, reverse_authors: bool = False) -> str:
         """Harvard: Family, G.I., Family, G.I. and Family, G.I."""
         if not authors:
             return ""
         fmt = []
         for a in authors[:max_n]:
             # Harvard uses initials without spaces: G.I.
-            given = a.get("given", "")
-            if given:
-                init = "".join([n[0] + "." for n in given.split() if n])
-            else:
-                init = ""
-            fam = a.get("family", "")
-            fmt.append(f"{fam}, {init}" if init else fam)
+            init = AuthorFormatter.initials(a.given, "", ".")
+            fam = a.family
+            fmt.append((fam + ", " + init) if init else fam)
         if reverse_authors and len(fmt) >= 2:
             fmt[0], fmt[-1] = fmt[-1], fmt[0]
         if len(authors) > max_n:
@@ -266,446 +332,310 @@ class AuthorFormatter:
         elif len(fmt) == 1:
             return fmt[0]
         elif len(fmt) == 2:
-            return f"{fmt[0]} and {fmt[1]}"
+            return fmt[0] + " and " + fmt[1]
         else:
             return ", ".join(fmt[:-1]) + " and " + fmt[-1]
 
 
+# Citation templates
+#
+# Each style is a _StyleSpec: the AuthorFormatter used, an index prefix
+# format ("" for unnumbered styles), and per entry type a pair of segment
+# lists (with title, title omitted) rendered after "<prefix><authors>".
+# Entry types without their own pair fall back to 'other'.
+# A segment is one of:
+#   str     literal delimiter, emitted as-is in plain and RTF
+#   _Field  field value; RTF output is escaped, or wrapped by mark "i"/"b"
+#   _If     `then` if the field is non-empty else `otherwise`; with
+#           plain_always the plain output always takes `then`
+_Field = namedtuple('_Field', 'name mark', defaults=("",))
+_If = namedtuple('_If', 'name then otherwise plain_always', defaults=((), False))
+_StyleSpec = namedtuple('_StyleSpec', 'authors prefix templates')
+
+_TITLE = _Field('title')
+_YEAR = _Field('year')
+_PAGES = _Field('pages')
+_PUBLISHER = _Field('publisher')
+_ADDRESS = _Field('address')
+_JOURNAL_I = _Field('journal', 'i')
+_TITLE_I = _Field('title', 'i')
+_DOI = _If('doi', (" DOI: ", _Field('doi')))
+_DOI_URL = _If('doi', (" https://doi.org/", _Field('doi')))
+
+_ACS_OTHER = ((" ", _TITLE, ". ", _YEAR, "."), (" ", _YEAR, "."))
+_NATURE_OTHER = ((", ", _TITLE, ", ", _YEAR, "."), (", ", _YEAR, "."))
+
+_ACS_ARTICLE = (_JOURNAL_I, " ", _YEAR, ", ",
+                _If('volume', (_Field('volume', 'i'),), (), True),
+                _If('pages', (", ", _PAGES, "."), (".",), True),
+                _DOI)
+_ACS_SPEC = _StyleSpec(AuthorFormatter.acs, "", {
+    'article': ((" ", _TITLE, ". ") + _ACS_ARTICLE, (" ",) + _ACS_ARTICLE),
+    'book': ((" ", _TITLE_I, "; ", _PUBLISHER, ": ", _ADDRESS, ", ", _YEAR, "."),
+             (" ", _PUBLISHER, ": ", _ADDRESS, ", ", _YEAR, ".")),
+    'other': _ACS_OTHER,
+})
+
+_APA_ARTICLE = (_JOURNAL_I, ", ",
+                _If('vol_issue', (_Field('vol_issue', 'i'),), (), True),
+                _If('pages', (", ", _PAGES, "."), (".",), True),
+                _DOI_URL)
+_APA_SPEC = _StyleSpec(AuthorFormatter.apa, "", {
+    'article': ((" (", _YEAR, "). ", _TITLE, ". ") + _APA_ARTICLE, (" (", _YEAR, "). ") + _APA_ARTICLE),
+    'book': ((" (", _YEAR, "). ", _TITLE_I, ". ", _PUBLISHER, "."),
+             (" (", _YEAR, "). ", _PUBLISHER, ".")),
+    'other': ((" (", _YEAR, "). ", _TITLE, "."), (" (", _YEAR, ").")),
+})
+
+_VANCOUVER_ARTICLE = (_JOURNAL_I, ". ", _YEAR, ";", _Field('vol_issue'), ":", _Field('pages_hyphen'), ".")
+_VANCOUVER_SPEC = _StyleSpec(AuthorFormatter.vancouver, "{}. ", {
+    'article': ((". ", _TITLE, ". ") + _VANCOUVER_ARTICLE, (". ",) + _VANCOUVER_ARTICLE),
+    'other': ((". ", _TITLE, ". ", _YEAR, "."), (". ", _YEAR, ".")),
+})
+
+_ANGEWANDTE_ARTICLE = (", ", _JOURNAL_I, " ", _YEAR, ", ", _Field('volume', 'i'), ", ", _PAGES, ".", _DOI)
+_ANGEWANDTE_SPEC = _StyleSpec(AuthorFormatter.nature, "", {
+    'article': (_ANGEWANDTE_ARTICLE, _ANGEWANDTE_ARTICLE),
+    'book': ((", ", _TITLE_I, ", ", _PUBLISHER, ", ", _ADDRESS, ", ", _YEAR, "."),
+             (", ", _PUBLISHER, ", ", _ADDRESS, ", ", _YEAR, ".")),
+    'other': _NATURE_OTHER,
+})
+
+_RSC_ARTICLE = (", ", _JOURNAL_I, ", ", _YEAR, ", ", _Field('volume', 'b'), ", ", _PAGES, ".", _DOI)
+_RSC_SPEC = _StyleSpec(AuthorFormatter.nature, "", {
+    'article': (_RSC_ARTICLE, _RSC_ARTICLE),
+    'book': ((", ", _TITLE_I, ", ", _PUBLISHER, ", ", _YEAR, "."),
+             (", ", _PUBLISHER, ", ", _YEAR, ".")),
+    'other': _NATURE_OTHER,
+})
+
+_AOA_ARTICLE = (_JOURNAL_I, " ", _Field('year', 'b'), ", ", _Field('volume', 'i'), ", ", _PAGES, ".", _DOI_URL)
+_AOA_SPEC = _StyleSpec(AuthorFormatter.acs, "", {
+    'article': ((" ", _TITLE, ". ") + _AOA_ARTICLE, (" ",) + _AOA_ARTICLE),
+    'other': _ACS_OTHER,
+})
+
+_NATURE_ARTICLE = (_JOURNAL_I, " ", _Field('volume', 'b'), ", ", _PAGES, " (", _YEAR, ").", _DOI_URL)
+_NATURE_SPEC = _StyleSpec(AuthorFormatter.nature, "{}. ", {
+    'article': ((" ", _TITLE, ". ") + _NATURE_ARTICLE, (" ",) + _NATURE_ARTICLE),
+    'book': ((" ", _TITLE_I, " (", _PUBLISHER, ", ", _YEAR, ")."),
+             (" (", _PUBLISHER, ", ", _YEAR, ").")),
+    'other': ((" ", _TITLE, " (", _YEAR, ")."), (" (", _YEAR, ").")),
+})
+
+_IEEE_SPEC = _StyleSpec(AuthorFormatter.ieee, "[{}] ", {
+    'article': ((", \"", _TITLE, ",\" ", _JOURNAL_I, ", ", _Field('detail'), ", ", _YEAR, "."),
+                (", ", _JOURNAL_I, ", ", _Field('detail'), ", ", _YEAR, ".")),
+    'book': ((", ", _TITLE_I, ". ", _ADDRESS, ": ", _PUBLISHER, ", ", _YEAR, "."),
+             (", ", _ADDRESS, ": ", _PUBLISHER, ", ", _YEAR, ".")),
+    'other': ((", \"", _TITLE, ",\" ", _YEAR, "."), (", ", _YEAR, ".")),
+})
+
+_ISBN = _If('isbn', (" ISBN ", _Field('isbn'), "."))
+_ISO690_ARTICLE = (_JOURNAL_I, ". ", _YEAR, ", ", _Field('vol_issue'), ", ", _PAGES, ".", _DOI)
+_ISO690_SPEC = _StyleSpec(AuthorFormatter.iso690, "[{}] ", {
+    'article': ((". ", _TITLE, ". ") + _ISO690_ARTICLE, (". ",) + _ISO690_ARTICLE),
+    'book': ((". ", _TITLE_I, ". ", _ADDRESS, ": ", _PUBLISHER, ", ", _YEAR, ".", _ISBN),
+             (". ", _ADDRESS, ": ", _PUBLISHER, ", ", _YEAR, ".", _ISBN)),
+    'other': ((". ", _TITLE, ". ", _YEAR, "."), (". ", _YEAR, ".")),
+})
+
+# Harvard: Author (Year) 'Title', Journal, Volume(Issue), Pages.
+# Harvard book: Author (Year) Title. Edition. Place: Publisher.
+_EDITION = _If('edition', (" ", _Field('edition'), " edn."))
+_HARVARD_DOI = _If('doi', (" doi: ", _Field('doi')))
+_HARVARD_SPEC = _StyleSpec(AuthorFormatter.harvard, "", {
+    'article': ((" (", _YEAR, ") '", _TITLE, "', ", _JOURNAL_I, ", ", _Field('vol_issue'), ", pp. ", _PAGES,
+                 ".", _HARVARD_DOI),
+                (" (", _YEAR, ") ", _JOURNAL_I, ", ", _Field('vol_issue'), ", pp. ", _PAGES, ".", _HARVARD_DOI)),
+    'book': ((" (", _YEAR, ") ", _TITLE_I, ".", _EDITION, " ", _ADDRESS, ": ", _PUBLISHER, "."),
+             (" (", _YEAR, ").", _EDITION, " ", _ADDRESS, ": ", _PUBLISHER, ".")),
+    'other': ((" (", _YEAR, ") '", _TITLE, "'."), (" (", _YEAR, ").")),
+})
+
+_RTF_MARKS = {"": _escape, "i": _italic, "b": _bold}
+
+
+def _render_segments(segments: tuple, f: Fields, plain: list, rtf: list) -> None:
+    for seg in segments:
+        if seg.__class__ is str:
+            plain.append(seg)
+            rtf.append(seg)
+        elif seg.__class__ is _Field:
+            value = getattr(f, seg.name)
+            plain.append(value)
+            rtf.append(_RTF_MARKS[seg.mark](value))
+        elif getattr(f, seg.name):
+            _render_segments(seg.then, f, plain, rtf)
+        elif seg.plain_always:
+            _render_segments(seg.then, f, plain, [])
+            _render_segments(seg.otherwise, f, [], rtf)
+        else:
+            _render_segments(seg.otherwise, f, plain, rtf)
+
+
 class CitationFormatter:
     """Format citations in various journal styles"""
     
     @staticmethod
-    def _get_fields(entry: Dict) -> Dict:
-        """Extract and clean common fields"""
-        return {
-            'authors': BibTeXProcessor.parse_authors(entry.get("author", "")),
-            'title': BibTeXProcessor.clean_latex(entry.get("title", "")),
-            'journal': BibTeXProcessor.clean_latex(entry.get("journal", "")),
-            'year': entry.get("year", ""),
-            'volume': entry.get("volume", ""),
-            'issue': entry.get("number", ""),
-            'pages': entry.get("pages", "").replace("--", "–"),
-            'doi': entry.get("doi", ""),
-            'publisher': BibTeXProcessor.clean_latex(entry.get("publisher", "")),
-            'address': BibTeXProcessor.clean_latex(entry.get("address", "")),
-            'entry_type': entry.get("ENTRYTYPE", "article").lower(),
-        }
-        
+    def prepare(entry: Dict) -> Fields:
+        """Clean an entry once for rendering in several styles.
+
+        Every format_* method accepts the returned Fields in place of the raw
+        entry dict.
+        """
+        return CitationFormatter._get_fields(entry)
+
+    @staticmethod
+    def _get_fields(entry: Dict) -> Fields:
+        """Extract and clean common fields, memoized on the entry itself.
+
+        The cache is validated against the raw source values because callers
+        (e.g. the author-reversal option in bib2ref.html) edit entries in place.
+        An already prepared Fields is returned as-is.
+        """
+        if entry.__class__ is Fields:
+            return entry
+        source = tuple(map(entry.get, _FIELD_SOURCE_KEYS))
+        cached = entry.get(_FIELDS_CACHE_KEY)
+        if cached is not None and cached[0] == source:
+            return cached[1]
+        volume = entry.get("volume", "")
+        issue = entry.get("number", "")
+        pages = entry.get("pages", "").replace("--", "–")
+        # IEEE: vol. V, no. N, pp. P
+        detail = []
+        if volume:
+            detail.append(f"vol. {volume}")
+        if issue:
+            detail.append(f"no. {issue}")
+        if pages:
+            detail.append(f"pp. {pages}")
+        # Journal, publisher and entry type come from small shared vocabularies
+        fields = Fields(
+            authors=BibTeXProcessor.parse_authors(entry.get("author", "")),
+            title=BibTeXProcessor.clean_latex(entry.get("title", "")),
+            journal=sys.intern(BibTeXProcessor.clean_latex(entry.get("journal", ""))),
+            year=entry.get("year", ""),
+            volume=volume,
+            issue=issue,
+            vol_issue=f"{volume}({issue})" if issue else volume,
+            pages=pages,
+            pages_hyphen=pages.replace("–", "-"),
+            detail=", ".join(detail),
+            doi=entry.get("doi", "").strip(),
+            publisher=sys.intern(BibTeXProcessor.clean_latex(entry.get("publisher", ""))),
+            address=BibTeXProcessor.clean_latex(entry.get("address", "")),
+            edition=entry.get("edition", ""),
+            isbn=entry.get("isbn", ""),
+            entry_type=sys.intern(entry.get("ENTRYTYPE", "article").lower()),
+            author_cache={},
+            render_cache={},
+        )
+        entry[_FIELDS_CACHE_KEY] = (source, fields)
+        return fields
+
+    @staticmethod
+    def _format_authors(f: Fields, style, max_n: int = None, reverse_authors: bool = False) -> tuple:
+        """Return (plain, RTF-escaped) author list for an AuthorFormatter style, cached per (style, max_n, reverse_authors)"""
+        key = (style, max_n, reverse_authors)
+        cached = f.author_cache.get(key)
+        if cached is None:
+            if max_n is not None:
+                auth = style(f.authors, max_n=max_n, reverse_authors=reverse_authors)
+            else:
+                auth = style(f.authors, reverse_authors=reverse_authors)
+            cached = f.author_cache[key] = (auth, RTFBuilder.escape(auth))
+        return cached
     
     @staticmethod
-    def format_acs(entry: Dict, idx: int = 0, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
-        """ACS style"""
+    def format_all(entries: List[Dict], style_fn, *, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
+        """Format a whole bibliography with one REFERENCE_STYLES function.
+
+        Entries are numbered from 1. Returns the plain text (one reference per
+        line) and a complete RTF document wrapped in HEADER/FOOTER only once.
+        """
+        plains = []
+        rtfs = []
+        for i, entry in enumerate(entries, 1):
+            plain, rtf = style_fn(entry, i, max_n=max_n, omit_title=omit_title, reverse_authors=reverse_authors)
+            plains.append(plain)
+            rtfs.append(rtf)
+        return "\n".join(plains), RTFBuilder.build_document(RTFBuilder.newline().join(rtfs))
+    
+    @staticmethod
+    def _render(entry: Dict, spec: _StyleSpec, idx: int, max_n: int, omit_title: bool, reverse_authors: bool) -> tuple:
+        """Render one entry with a style spec; returns (plain, rtf), cached alongside the entry's fields"""
         f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.acs(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.acs(f['authors'], reverse_authors=reverse_authors)
-
-        if f['entry_type'] == "article":
-            if omit_title:
-                plain = f"{auth} {f['journal']} {f['year']}, {f['volume']}, {f['pages']}."
-                if f['doi']:
-                    plain += f" DOI: {f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f" {f['year']}, ") +
-                       (RTFBuilder.italic(f['volume']) if f['volume'] else "") +
-                       RTFBuilder.escape(f", {f['pages']}." if f['pages'] else "."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" DOI: {f['doi']}")
-            else:
-                plain = f"{auth} {f['title']}. {f['journal']} {f['year']}, {f['volume']}, {f['pages']}."
-                if f['doi']:
-                    plain += f" DOI: {f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} {f['title']}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f" {f['year']}, ") +
-                       (RTFBuilder.italic(f['volume']) if f['volume'] else "") +
-                       RTFBuilder.escape(f", {f['pages']}." if f['pages'] else "."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" DOI: {f['doi']}")
-        elif f['entry_type'] == "book":
-            if omit_title:
-                plain = f"{auth} {f['publisher']}: {f['address']}, {f['year']}."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"{auth} {f['title']}; {f['publisher']}: {f['address']}, {f['year']}."
-                rtf = (RTFBuilder.escape(f"{auth} ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f"; {f['publisher']}: {f['address']}, {f['year']}."))
+        # Specs are module-level constants, so id() is a stable key for them
+        key = (id(spec), idx, max_n, omit_title, reverse_authors)
+        result = f.render_cache.get(key)
+        if result is not None:
+            return result
+        auth, auth_esc = CitationFormatter._format_authors(f, spec.authors, max_n, reverse_authors)
+        prefix = spec.prefix.format(idx) if spec.prefix else ""
+        plain = [prefix, auth]
+        rtf = [prefix, auth_esc]
+        templates = spec.templates.get(f.entry_type) or spec.templates['other']
+        _render_segments(templates[1 if omit_title else 0], f, plain, rtf)
+        # Templates end in a literal or the DOI and never carry trailing
+        # whitespace; only an empty author list can leave a leading space.
+        if not auth and not prefix:
+            result = ("".join(plain).lstrip(), "".join(rtf).lstrip())
         else:
-            if omit_title:
-                plain = f"{auth} {f['year']}."
-            else:
-                plain = f"{auth} {f['title']}. {f['year']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+            result = ("".join(plain), "".join(rtf))
+        f.render_cache[key] = result
+        return result
+    
+    @staticmethod
+    def format_acs(entry: Dict, idx: int = 0, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
+        """ACS style"""
+        return CitationFormatter._render(entry, _ACS_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_apa(entry: Dict, idx: int = 0, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """APA 7th style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.apa(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.apa(f['authors'], reverse_authors=reverse_authors)
-        vol_issue = f"{f['volume']}({f['issue']})" if f['issue'] else f['volume']
-
-        if f['entry_type'] == "article":
-            if omit_title:
-                plain = f"{auth} ({f['year']}). {f['journal']}, {vol_issue}, {f['pages']}."
-                if f['doi']:
-                    plain += f" https://doi.org/{f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} ({f['year']}). ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(", ") +
-                       (RTFBuilder.italic(vol_issue) if vol_issue else "") +
-                       RTFBuilder.escape(f", {f['pages']}." if f['pages'] else "."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" https://doi.org/{f['doi']}")
-            else:
-                plain = f"{auth} ({f['year']}). {f['title']}. {f['journal']}, {vol_issue}, {f['pages']}."
-                if f['doi']:
-                    plain += f" https://doi.org/{f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} ({f['year']}). {f['title']}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(", ") +
-                       (RTFBuilder.italic(vol_issue) if vol_issue else "") +
-                       RTFBuilder.escape(f", {f['pages']}." if f['pages'] else "."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" https://doi.org/{f['doi']}")
-        elif f['entry_type'] == "book":
-            if omit_title:
-                plain = f"{auth} ({f['year']}). {f['publisher']}."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"{auth} ({f['year']}). {f['title']}. {f['publisher']}."
-                rtf = (RTFBuilder.escape(f"{auth} ({f['year']}). ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f". {f['publisher']}."))
-        else:
-            if omit_title:
-                plain = f"{auth} ({f['year']})."
-            else:
-                plain = f"{auth} ({f['year']}). {f['title']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _APA_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_vancouver(entry: Dict, idx: int = 1, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """Vancouver style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.vancouver(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.vancouver(f['authors'], reverse_authors=reverse_authors)
-        pages = f['pages'].replace("–", "-")
-        vol_issue = f"{f['volume']}({f['issue']})" if f['issue'] else f['volume']
-
-        if f['entry_type'] == "article":
-            if omit_title:
-                plain = f"{idx}. {auth}. {f['journal']}. {f['year']};{vol_issue}:{pages}."
-                rtf = (RTFBuilder.escape(f"{idx}. {auth}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f". {f['year']};{vol_issue}:{pages}."))
-            else:
-                plain = f"{idx}. {auth}. {f['title']}. {f['journal']}. {f['year']};{vol_issue}:{pages}."
-                rtf = (RTFBuilder.escape(f"{idx}. {auth}. {f['title']}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f". {f['year']};{vol_issue}:{pages}."))
-        else:
-            if omit_title:
-                plain = f"{idx}. {auth}. {f['year']}."
-            else:
-                plain = f"{idx}. {auth}. {f['title']}. {f['year']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _VANCOUVER_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_angewandte(entry: Dict, idx: int = 0, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """Angewandte Chemie style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.nature(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.nature(f['authors'], reverse_authors=reverse_authors)
-
-        if f['entry_type'] == "article":
-            plain = f"{auth}, {f['journal']} {f['year']}, {f['volume']}, {f['pages']}."
-            if f['doi']:
-                plain += f" DOI: {f['doi']}"
-            rtf = (RTFBuilder.escape(f"{auth}, ") +
-                   RTFBuilder.italic(f['journal']) +
-                   RTFBuilder.escape(f" {f['year']}, ") +
-                   RTFBuilder.italic(f['volume']) +
-                   RTFBuilder.escape(f", {f['pages']}."))
-            if f['doi']:
-                rtf += RTFBuilder.escape(f" DOI: {f['doi']}")
-        elif f['entry_type'] == "book":
-            if omit_title:
-                plain = f"{auth}, {f['publisher']}, {f['address']}, {f['year']}."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"{auth}, {f['title']}, {f['publisher']}, {f['address']}, {f['year']}."
-                rtf = (RTFBuilder.escape(f"{auth}, ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f", {f['publisher']}, {f['address']}, {f['year']}."))
-        else:
-            if omit_title:
-                plain = f"{auth}, {f['year']}."
-            else:
-                plain = f"{auth}, {f['title']}, {f['year']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _ANGEWANDTE_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_rsc(entry: Dict, idx: int = 0, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """RSC style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.nature(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.nature(f['authors'], reverse_authors=reverse_authors)
-
-        if f['entry_type'] == "article":
-            plain = f"{auth}, {f['journal']}, {f['year']}, {f['volume']}, {f['pages']}."
-            if f['doi']:
-                plain += f" DOI: {f['doi']}"
-            rtf = (RTFBuilder.escape(f"{auth}, ") +
-                   RTFBuilder.italic(f['journal']) +
-                   RTFBuilder.escape(f", {f['year']}, ") +
-                   RTFBuilder.bold(f['volume']) +
-                   RTFBuilder.escape(f", {f['pages']}."))
-            if f['doi']:
-                rtf += RTFBuilder.escape(f" DOI: {f['doi']}")
-        elif f['entry_type'] == "book":
-            if omit_title:
-                plain = f"{auth}, {f['publisher']}, {f['year']}."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"{auth}, {f['title']}, {f['publisher']}, {f['year']}."
-                rtf = (RTFBuilder.escape(f"{auth}, ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f", {f['publisher']}, {f['year']}."))
-        else:
-            if omit_title:
-                plain = f"{auth}, {f['year']}."
-            else:
-                plain = f"{auth}, {f['title']}, {f['year']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _RSC_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_aoa(entry: Dict, idx: int = 0, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """AoA (Accounts of Chemical Research) style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.acs(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.acs(f['authors'], reverse_authors=reverse_authors)
-
-        if f['entry_type'] == "article":
-            if omit_title:
-                plain = f"{auth} {f['journal']} {f['year']}, {f['volume']}, {f['pages']}."
-                if f['doi']:
-                    plain += f" https://doi.org/{f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(" ") +
-                       RTFBuilder.bold(f['year']) +
-                       RTFBuilder.escape(", ") +
-                       RTFBuilder.italic(f['volume']) +
-                       RTFBuilder.escape(f", {f['pages']}."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" https://doi.org/{f['doi']}")
-            else:
-                plain = f"{auth} {f['title']}. {f['journal']} {f['year']}, {f['volume']}, {f['pages']}."
-                if f['doi']:
-                    plain += f" https://doi.org/{f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} {f['title']}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(" ") +
-                       RTFBuilder.bold(f['year']) +
-                       RTFBuilder.escape(", ") +
-                       RTFBuilder.italic(f['volume']) +
-                       RTFBuilder.escape(f", {f['pages']}."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" https://doi.org/{f['doi']}")
-        else:
-            if omit_title:
-                plain = f"{auth} {f['year']}."
-            else:
-                plain = f"{auth} {f['title']}. {f['year']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _AOA_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_nature(entry: Dict, idx: int = 1, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """Nature style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.nature(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.nature(f['authors'], reverse_authors=reverse_authors)
-
-        if f['entry_type'] == "article":
-            if omit_title:
-                plain = f"{idx}. {auth} {f['journal']} {f['volume']}, {f['pages']} ({f['year']})."
-                if f['doi']:
-                    plain += f" https://doi.org/{f['doi']}"
-                rtf = (RTFBuilder.escape(f"{idx}. {auth} ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(" ") +
-                       RTFBuilder.bold(f['volume']) +
-                       RTFBuilder.escape(f", {f['pages']} ({f['year']})."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" https://doi.org/{f['doi']}")
-            else:
-                plain = f"{idx}. {auth} {f['title']}. {f['journal']} {f['volume']}, {f['pages']} ({f['year']})."
-                if f['doi']:
-                    plain += f" https://doi.org/{f['doi']}"
-                rtf = (RTFBuilder.escape(f"{idx}. {auth} {f['title']}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(" ") +
-                       RTFBuilder.bold(f['volume']) +
-                       RTFBuilder.escape(f", {f['pages']} ({f['year']})."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" https://doi.org/{f['doi']}")
-        elif f['entry_type'] == "book":
-            if omit_title:
-                plain = f"{idx}. {auth} ({f['publisher']}, {f['year']})."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"{idx}. {auth} {f['title']} ({f['publisher']}, {f['year']})."
-                rtf = (RTFBuilder.escape(f"{idx}. {auth} ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f" ({f['publisher']}, {f['year']})."))
-        else:
-            if omit_title:
-                plain = f"{idx}. {auth} ({f['year']})."
-            else:
-                plain = f"{idx}. {auth} {f['title']} ({f['year']})."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _NATURE_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_ieee(entry: Dict, idx: int = 1, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """IEEE style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.ieee(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.ieee(f['authors'], reverse_authors=reverse_authors)
-
-        if f['entry_type'] == "article":
-            parts = []
-            if f['volume']:
-                parts.append(f"vol. {f['volume']}")
-            if f['issue']:
-                parts.append(f"no. {f['issue']}")
-            if f['pages']:
-                parts.append(f"pp. {f['pages']}")
-            detail = ", ".join(parts)
-
-            if omit_title:
-                plain = f"[{idx}] {auth}, {f['journal']}, {detail}, {f['year']}."
-                rtf = (RTFBuilder.escape(f"[{idx}] {auth}, ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f", {detail}, {f['year']}."))
-            else:
-                plain = f"[{idx}] {auth}, \"{f['title']},\" {f['journal']}, {detail}, {f['year']}."
-                rtf = (RTFBuilder.escape(f"[{idx}] {auth}, \"{f['title']},\" ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f", {detail}, {f['year']}."))
-        elif f['entry_type'] == "book":
-            if omit_title:
-                plain = f"[{idx}] {auth}, {f['address']}: {f['publisher']}, {f['year']}."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"[{idx}] {auth}, {f['title']}. {f['address']}: {f['publisher']}, {f['year']}."
-                rtf = (RTFBuilder.escape(f"[{idx}] {auth}, ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f". {f['address']}: {f['publisher']}, {f['year']}."))
-        else:
-            if omit_title:
-                plain = f"[{idx}] {auth}, {f['year']}."
-            else:
-                plain = f"[{idx}] {auth}, \"{f['title']},\" {f['year']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _IEEE_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_iso690(entry: Dict, idx: int = 1, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """ISO 690 style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.iso690(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.iso690(f['authors'], reverse_authors=reverse_authors)
-        vol_issue = f"{f['volume']}({f['issue']})" if f['issue'] else f['volume']
-
-        if f['entry_type'] == "article":
-            if omit_title:
-                plain = f"[{idx}] {auth}. {f['journal']}. {f['year']}, {vol_issue}, {f['pages']}."
-                if f['doi']:
-                    plain += f" DOI: {f['doi']}"
-                rtf = (RTFBuilder.escape(f"[{idx}] {auth}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f". {f['year']}, {vol_issue}, {f['pages']}."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" DOI: {f['doi']}")
-            else:
-                plain = f"[{idx}] {auth}. {f['title']}. {f['journal']}. {f['year']}, {vol_issue}, {f['pages']}."
-                if f['doi']:
-                    plain += f" DOI: {f['doi']}"
-                rtf = (RTFBuilder.escape(f"[{idx}] {auth}. {f['title']}. ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f". {f['year']}, {vol_issue}, {f['pages']}."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" DOI: {f['doi']}")
-        elif f['entry_type'] == "book":
-            isbn = entry.get("isbn", "")
-            if omit_title:
-                plain = f"[{idx}] {auth}. {f['address']}: {f['publisher']}, {f['year']}."
-                if isbn:
-                    plain += f" ISBN {isbn}."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"[{idx}] {auth}. {f['title']}. {f['address']}: {f['publisher']}, {f['year']}."
-                if isbn:
-                    plain += f" ISBN {isbn}."
-                rtf = (RTFBuilder.escape(f"[{idx}] {auth}. ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f". {f['address']}: {f['publisher']}, {f['year']}."))
-                if isbn:
-                    rtf += RTFBuilder.escape(f" ISBN {isbn}.")
-        else:
-            if omit_title:
-                plain = f"[{idx}] {auth}. {f['year']}."
-            else:
-                plain = f"[{idx}] {auth}. {f['title']}. {f['year']}."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _ISO690_SPEC, idx, max_n, omit_title, reverse_authors)
     
     @staticmethod
     def format_harvard(entry: Dict, idx: int = 0, max_n: int = None, omit_title: bool = False, reverse_authors: bool = False) -> tuple:
         """Harvard style"""
-        f = CitationFormatter._get_fields(entry)
-        auth = AuthorFormatter.harvard(f['authors'], max_n=max_n, reverse_authors=reverse_authors) if max_n is not None else AuthorFormatter.harvard(f['authors'], reverse_authors=reverse_authors)
-
-        if f['entry_type'] == "article":
-            # Harvard: Author (Year) 'Title', Journal, Volume(Issue), Pages.
-            vol_issue = f"{f['volume']}({f['issue']})" if f['issue'] else f['volume']
-            if omit_title:
-                plain = f"{auth} ({f['year']}) {f['journal']}, {vol_issue}, pp. {f['pages']}."
-                if f['doi']:
-                    plain += f" doi: {f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} ({f['year']}) ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f", {vol_issue}, pp. {f['pages']}."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" doi: {f['doi']}")
-            else:
-                plain = f"{auth} ({f['year']}) '{f['title']}', {f['journal']}, {vol_issue}, pp. {f['pages']}."
-                if f['doi']:
-                    plain += f" doi: {f['doi']}"
-                rtf = (RTFBuilder.escape(f"{auth} ({f['year']}) '{f['title']}', ") +
-                       RTFBuilder.italic(f['journal']) +
-                       RTFBuilder.escape(f", {vol_issue}, pp. {f['pages']}."))
-                if f['doi']:
-                    rtf += RTFBuilder.escape(f" doi: {f['doi']}")
-        elif f['entry_type'] == "book":
-            # Harvard book: Author (Year) Title. Edition. Place: Publisher.
-            edition = entry.get("edition", "")
-            edition_str = f" {edition} edn." if edition else ""
-            if omit_title:
-                plain = f"{auth} ({f['year']}).{edition_str} {f['address']}: {f['publisher']}."
-                rtf = RTFBuilder.escape(plain)
-            else:
-                plain = f"{auth} ({f['year']}) {f['title']}.{edition_str} {f['address']}: {f['publisher']}."
-                rtf = (RTFBuilder.escape(f"{auth} ({f['year']}) ") +
-                       RTFBuilder.italic(f['title']) +
-                       RTFBuilder.escape(f".{edition_str} {f['address']}: {f['publisher']}."))
-        else:
-            if omit_title:
-                plain = f"{auth} ({f['year']})."
-            else:
-                plain = f"{auth} ({f['year']}) '{f['title']}'."
-            rtf = RTFBuilder.escape(plain)
-        return plain.strip(), rtf.strip()
+        return CitationFormatter._render(entry, _HARVARD_SPEC, idx, max_n, omit_title, reverse_authors)
 
 class HTMLBuilder:
     """HTML formatting helper for web display"""
@@ -726,16 +656,18 @@ class InTextFormatter:
     
     @staticmethod
     def get_author_year(entry: Dict) -> tuple:
-        authors = BibTeXProcessor.parse_authors(entry.get("author", ""))
-        year = entry.get("year", "")
+        # Shares the per-entry fields cache with CitationFormatter
+        f = CitationFormatter._get_fields(entry)
+        authors = f.authors
+        year = f.year
         if not authors:
             return "Unknown", year
         if len(authors) == 1:
-            auth = authors[0]["family"]
+            auth = authors[0].family
         elif len(authors) == 2:
-            auth = f"{authors[0]['family']} & {authors[1]['family']}"
+            auth = f"{authors[0].family} & {authors[1].family}"
         else:
-            auth = f"{authors[0]['family']} et al."
+            auth = f"{authors[0].family} et al."
         return auth, year
     
     @staticmethod
@@ -757,7 +689,7 @@ class InTextFormatter:
     
     @staticmethod
     def superscript(entry: Dict, idx: int = 1) -> tuple:
-        return str(idx), RTFBuilder.superscript(str(idx))
+        return str(idx), _superscript(str(idx))
 
 
 # Style registries
@@ -788,9 +720,10 @@ if __name__ == "__main__":
     entries = BibTeXProcessor.parse_bibtex(bib)
     print(f"Parsed {len(entries)} entries\n")
     print(entries)
+    prepared = [CitationFormatter.prepare(e) for e in entries[:2]]
     for style_name, formatter in REFERENCE_STYLES.items():
         print(f"=== {style_name} ===")
-        for i, e in enumerate(entries[:2], 1):
-            plain, rtf = formatter(e, i)
+        for i, p in enumerate(prepared, 1):
+            plain, rtf = formatter(p, i)
             print(plain)
         print()
\ No newline at end of file
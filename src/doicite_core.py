@@ -1,62 +1,190 @@
 import json
 import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import quote
 try:
     from pyodide.http import pyfetch
 except ImportError:
     # Fallback for local testing or non-PyScript environments
-    pass
+    pyfetch = None
+    try:
+        import aiohttp
+    except ImportError:
+        aiohttp = None
 
 class DOIProcessor:
     """Class to fetch and parse metadata from Crossref API using DOIs."""
 
+    # Maximum number of Crossref requests in flight at once
+    MAX_CONCURRENT_REQUESTS = 5
+
+    # Above this many DOIs, try a single works?filter=doi:... request first
+    BATCH_THRESHOLD = 5
+
+    # Minimum spacing (seconds) between request starts, taken from Crossref's
+    # X-Rate-Limit-Limit / X-Rate-Limit-Interval headers; 0 until known
+    _request_interval = 0.0
+    _next_request_at = 0.0
+
     @staticmethod
     async def fetch_doi_entries(doi_input):
         """
         Fetch metadata for DOIs using Crossref API.
         
+        More than BATCH_THRESHOLD DOIs are first requested in one Crossref
+        filter query. DOIs missing from that response (or all of them, if it
+        fails) are requested individually, concurrently, bounded by
+        MAX_CONCURRENT_REQUESTS.
+        Results keep the input order; DOIs that fail to resolve are skipped.
+        
         Args:
             doi_input (str): Single DOI or multiline string of DOIs.
             
         Returns:
             list: List of BibTeX-like dictionaries.
         """
-        entries = []
         # Split by newlines and filter empty lines
         dois = [line.strip() for line in doi_input.split('\n') if line.strip()]
         
-        for i, doi in enumerate(dois):
-            # Respectful delay for API
-            if i > 0:
-                await asyncio.sleep(1)
-            # Basic cleanup for common DOI formats (e.g., full URL)
-            clean_doi = doi
-            if "doi.org/" in clean_doi:
-                clean_doi = clean_doi.split("doi.org/")[-1]
-            clean_doi = clean_doi.strip()
+        semaphore = asyncio.Semaphore(DOIProcessor.MAX_CONCURRENT_REQUESTS)
+        if pyfetch is None and aiohttp is not None:
+            # Outside PyScript, share one aiohttp session so requests reuse the
+            # keep-alive connection. In the browser pyfetch goes through fetch(),
+            # which already does this.
+            async with aiohttp.ClientSession() as session:
+                return await DOIProcessor._fetch_all(dois, semaphore, session.get)
+        return await DOIProcessor._fetch_all(dois, semaphore, DOIProcessor._pyfetch_get)
+
+    @staticmethod
+    @asynccontextmanager
+    async def _pyfetch_get(url):
+        """pyfetch wrapped as an async context manager, like aiohttp's session.get."""
+        yield await pyfetch(url)
+
+    @staticmethod
+    async def _fetch_all(dois, semaphore, fetch):
+        """Fetch all DOIs with the given fetch function, batched when worthwhile."""
+        clean_dois = [doi for doi in map(DOIProcessor._clean_doi, dois) if doi]
+        
+        # Crossref returns DOIs in lower case; key results the same way
+        found = {}
+        if len(clean_dois) > DOIProcessor.BATCH_THRESHOLD:
+            found = await DOIProcessor._fetch_batch(clean_dois, fetch)
+        
+        missing = [doi for doi in clean_dois if doi.lower() not in found]
+        results = await asyncio.gather(*[DOIProcessor._fetch_one(doi, semaphore, fetch) for doi in missing])
+        found.update(zip([doi.lower() for doi in missing], results))
+        
+        entries = [found[doi.lower()] for doi in clean_dois]
+        return [entry for entry in entries if entry]
+
+    @staticmethod
+    def _clean_doi(doi):
+        """Basic cleanup for common DOI formats (e.g., full URL)."""
+        if "doi.org/" in doi:
+            doi = doi.split("doi.org/")[-1]
+        return doi.strip()
+
+    @staticmethod
+    async def _fetch_batch(clean_dois, fetch):
+        """
+        Fetch several DOIs with one Crossref filter query.
+        
+        Args:
+            clean_dois (list): DOIs without doi.org prefix.
+            fetch: _pyfetch_get or aiohttp.ClientSession.get; used as
+                `async with fetch(url) as response` so the connection is released.
             
-            if not clean_doi:
-                continue
+        Returns:
+            dict: Lower-cased DOI -> BibTeX-like dictionary; empty on failure.
+        """
+        # Percent-encode each DOI so ',', '&' or '#' in it cannot split the filter
+        filter_param = ','.join(f"doi:{quote(doi, safe='/')}" for doi in clean_dois)
+        url = f"https://api.crossref.org/works?filter={filter_param}&rows={len(clean_dois)}"
+        
+        try:
+            await DOIProcessor._wait_for_rate_limit()
+            async with fetch(url) as response:
+                DOIProcessor._update_rate_limit(response.headers)
+                
+                if response.status != 200:
+                    print(f"Batch fetch failed: {response.status}")
+                    return {}
+                data = await response.json()
+            items = data.get('message', {}).get('items', [])
+        except Exception as e:
+            print(f"Error in batch DOI fetch: {e}")
+            return {}
+        
+        # A malformed item only loses its own DOI, which then goes through
+        # the per-DOI fallback
+        found = {}
+        for item in items:
+            try:
+                found[item.get('DOI', '').lower()] = DOIProcessor._parse_crossref_json(item)
+            except Exception as e:
+                print(f"Error parsing batch item: {e}")
+        return found
 
-            # Crossref API URL
-            url = f"https://api.crossref.org/works/{clean_doi}"
+    @staticmethod
+    async def _fetch_one(clean_doi, semaphore, fetch):
+        """
+        Fetch and parse a single DOI, waiting for a free request slot.
+        
+        Args:
+            clean_doi (str): DOI without doi.org prefix.
+            semaphore (asyncio.Semaphore): Limits concurrent requests.
+            fetch: _pyfetch_get or aiohttp.ClientSession.get; used as
+                `async with fetch(url) as response` so the connection is released.
             
+        Returns:
+            dict or None: BibTeX-like dictionary, or None on failure.
+        """
+        # Crossref API URL
+        url = f"https://api.crossref.org/works/{clean_doi}"
+        
+        async with semaphore:
             try:
                 # Use pyfetch for async request in PyScript
                 # Using method="GET" by default
-                response = await pyfetch(url)
-                
-                if response.status == 200:
-                    data = await response.json()
-                    item = data.get('message', {})
-                    entry = DOIProcessor._parse_crossref_json(item)
-                    if entry:
-                        entries.append(entry)
-                else:
+                await DOIProcessor._wait_for_rate_limit()
+                async with fetch(url) as response:
+                    DOIProcessor._update_rate_limit(response.headers)
+                    
+                    if response.status == 200:
+                        data = await response.json()
+                        item = data.get('message', {})
+                        return DOIProcessor._parse_crossref_json(item)
                     print(f"Failed to fetch {clean_doi}: {response.status}")
             except Exception as e:
                 print(f"Error fetching DOI {clean_doi}: {e}")
-                
-        return entries
+        return None
+
+    @staticmethod
+    async def _wait_for_rate_limit():
+        """Reserve the next request slot and sleep until it starts."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, DOIProcessor._next_request_at)
+        DOIProcessor._next_request_at = start + DOIProcessor._request_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @staticmethod
+    def _update_rate_limit(headers):
+        """
+        Adapt request spacing to Crossref's advertised rate limit.
+        
+        Args:
+            headers (dict): Response headers, e.g. {'x-rate-limit-limit': '50',
+                'x-rate-limit-interval': '1s'}.
+        """
+        try:
+            limit = int(headers.get('x-rate-limit-limit'))
+            interval = float(headers.get('x-rate-limit-interval', '1s').rstrip('s'))
+        except (TypeError, ValueError, AttributeError):
+            return
+        if limit > 0:
+            DOIProcessor._request_interval = interval / limit
 
     @staticmethod
     def _parse_crossref_json(item):
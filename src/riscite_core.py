@@ -5,23 +5,40 @@ from io import StringIO
 # Import necessary components from bibcite_core
 from src.bibcite_core import REFERENCE_STYLES, BibTeXProcessor
 
+# rtf_to_html patterns (compiled once at import)
+_RTF_TAG = re.compile(r'\{\\(i|b|super)\s+(.*?)\}')
+# \par, unicode escapes (e.g. \u946?) and remaining control words in one pass
+_RTF_MISC = re.compile(r'(\\par\s*)|\\u(\d+)\?|\\[a-z]+\d*\s*')
+_HTML_TAGS = {'i': 'i', 'b': 'b', 'super': 'sup'}
+
+
+def _rtf_tag_to_html(m):
+    tag = _HTML_TAGS[m.group(1)]
+    return f"<{tag}>{m.group(2)}</{tag}>"
+
+
+def _rtf_misc_to_html(m):
+    if m.group(1):
+        return '<br>'
+    code = m.group(2)
+    return chr(int(code)) if code else ''
+
+
 def rtf_to_html(rtf_text):
     """Convert RTF formatting to HTML for web display"""
-    # Remove RTF header and footer
-    rtf_text = re.sub(r'^\{\\rtf.*?\\fs24\s*', '', rtf_text)
-    rtf_text = re.sub(r'\}$', '', rtf_text)
+    # Remove RTF header (up to the font size control) and footer
+    if rtf_text.startswith('{\\rtf'):
+        i = rtf_text.find('\\fs24')
+        if i != -1:
+            rtf_text = rtf_text[i + 5:].lstrip()
+    if rtf_text.endswith('}'):
+        rtf_text = rtf_text[:-1]
     
     # Convert RTF formatting to HTML
-    rtf_text = re.sub(r'\{\\i\s+(.*?)\}', r'<i>\1</i>', rtf_text)
-    rtf_text = re.sub(r'\{\\b\s+(.*?)\}', r'<b>\1</b>', rtf_text)
-    rtf_text = re.sub(r'\{\\super\s+(.*?)\}', r'<sup>\1</sup>', rtf_text)
-    rtf_text = re.sub(r'\\par\s*', '<br>', rtf_text)
+    rtf_text = _RTF_TAG.sub(_rtf_tag_to_html, rtf_text)
     
-    # Handle unicode characters (e.g. \u946?)
-    rtf_text = re.sub(r'\\u(\d+)\?', lambda m: chr(int(m.group(1))), rtf_text)
-    
-    # Clean up remaining RTF codes
-    rtf_text = re.sub(r'\\[a-z]+\d*\s*', '', rtf_text)
+    # Line breaks, unicode characters and remaining RTF codes
+    rtf_text = _RTF_MISC.sub(_rtf_misc_to_html, rtf_text)
     rtf_text = rtf_text.replace('\\\\', '\\').replace('\\{', '{').replace('\\}', '}')
     
     return rtf_text.strip()
@@ -40,6 +57,17 @@ class RISProcessor:
         'UNPB': 'unpublished',
     }
     
+    # rispy keys copied as-is / converted to str: (RIS key, BibTeX key)
+    SIMPLE_FIELDS = (
+        ('doi', 'doi'),                  # DO
+        ('publisher', 'publisher'),      # PB
+        ('place_published', 'address'),  # AD, CY
+    )
+    STRING_FIELDS = (
+        ('volume', 'volume'),            # VL
+        ('number', 'number'),            # IS
+    )
+    
     @staticmethod
     def parse_ris(ris_str):
         """
@@ -55,66 +83,61 @@ class RISProcessor:
         
         try:
             # rispy.loads() を使用してRISを解析
-            # StringIOを使ってファイルライクオブジェクトとして扱う
-            ris_file = StringIO(ris_str)
-            ris_entries = rispy.load(ris_file)
+            # loads() が無い古いrispyではStringIOを使ってファイルライクオブジェクトとして扱う
+            if hasattr(rispy, 'loads'):
+                ris_entries = rispy.loads(ris_str)
+            else:
+                ris_entries = rispy.load(StringIO(ris_str))
             
             # 各エントリをBibTeX形式に変換
+            type_map_get = RISProcessor.TYPE_MAP.get
+            simple_fields = RISProcessor.SIMPLE_FIELDS
+            string_fields = RISProcessor.STRING_FIELDS
             for ris_entry in ris_entries:
+                get = ris_entry.get
                 bib_entry = {}
                 
                 # Entry type (TY field)
-                ris_type = ris_entry.get('type_of_reference', 'JOUR')
-                bib_entry['ENTRYTYPE'] = RISProcessor.TYPE_MAP.get(ris_type, 'article')
+                bib_entry['ENTRYTYPE'] = type_map_get(get('type_of_reference', 'JOUR'), 'article')
                 
                 # Title (TI or T1)
                 if 'title' in ris_entry or 'primary_title' in ris_entry:
-                    bib_entry['title'] = ris_entry.get('title') or ris_entry.get('primary_title', '')
+                    bib_entry['title'] = get('title') or get('primary_title', '')
                 
                 # Authors (AU) - rispy returns a list
-                if 'authors' in ris_entry and ris_entry['authors']:
-                    bib_entry['author'] = ' and '.join(ris_entry['authors'])
+                authors = get('authors')
+                if authors:
+                    bib_entry['author'] = ' and '.join(authors)
                 
                 # Journal (JO, JF, T2)
-                journal = (ris_entry.get('journal_name') or 
-                          ris_entry.get('alternate_title1') or 
-                          ris_entry.get('secondary_title', ''))
+                journal = get('journal_name') or get('alternate_title1') or get('secondary_title', '')
                 if journal:
                     bib_entry['journal'] = journal
                 
                 # Year (PY, Y1)
-                if 'year' in ris_entry:
-                    bib_entry['year'] = str(ris_entry['year'])
-                elif 'publication_year' in ris_entry:
-                    bib_entry['year'] = str(ris_entry['publication_year'])
-                
-                # Volume (VL)
-                if 'volume' in ris_entry:
-                    bib_entry['volume'] = str(ris_entry['volume'])
+                year = get('year')
+                if year is None:
+                    year = get('publication_year')
+                if year is not None:
+                    bib_entry['year'] = str(year)
                 
-                # Issue/Number (IS)
-                if 'number' in ris_entry:
-                    bib_entry['number'] = str(ris_entry['number'])
+                for src, dst in string_fields:
+                    value = get(src)
+                    if value is not None:
+                        bib_entry[dst] = str(value)
                 
                 # Pages (SP and EP)
-                start_page = ris_entry.get('start_page', '')
-                end_page = ris_entry.get('end_page', '')
+                start_page = get('start_page', '')
+                end_page = get('end_page', '')
                 if start_page and end_page:
                     bib_entry['pages'] = f"{start_page}--{end_page}"
                 elif start_page:
                     bib_entry['pages'] = str(start_page)
                 
-                # DOI
-                if 'doi' in ris_entry:
-                    bib_entry['doi'] = ris_entry['doi']
-                
-                # Publisher (PB)
-                if 'publisher' in ris_entry:
-                    bib_entry['publisher'] = ris_entry['publisher']
-                
-                # Address (AD, CY)
-                if 'place_published' in ris_entry:
-                    bib_entry['address'] = ris_entry['place_published']
+                for src, dst in simple_fields:
+                    value = get(src)
+                    if value is not None:
+                        bib_entry[dst] = value
                 
                 entries.append(bib_entry)
                 